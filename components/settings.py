@@ -1,27 +1,122 @@
 import streamlit as st
-import json
 import os
+import copy
 from datetime import datetime
 from typing import Dict, Any
 import zipfile
 import io
+import shutil
+import sqlite3
+from contextlib import closing
+import pandas as pd
+
+from utils import jsonio
+from utils.form_builder import get_form_builder, replace_forms
+
+_DEFAULT_SETTINGS = {
+    "general": {
+        "app_name": "n8n Business Suite",
+        "theme": "light",
+        "auto_save": True,
+        "notifications": True,
+        "language": "en",
+        "timezone": "UTC"
+    },
+    "webhooks": {
+        "timeout": 30,
+        "retry_attempts": 3,
+        "retry_delay": 5,
+        "default_headers": {
+            "Content-Type": "application/json",
+            "User-Agent": "n8n-business-suite/1.0"
+        }
+    },
+    "forms": {
+        "max_file_size": 10,  # MB
+        "allowed_file_types": ["pdf", "jpg", "jpeg", "png", "mp3", "wav", "m4a"],
+        "required_field_indicator": "*",
+        "validation_enabled": True
+    },
+    "security": {
+        "enable_csrf": True,
+        "session_timeout": 3600,  # seconds
+        "max_login_attempts": 5,
+        "password_min_length": 8
+    },
+    "analytics": {
+        "track_form_submissions": True,
+        "track_webhook_calls": True,
+        "retention_days": 90,
+        "export_format": "json"
+    },
+    "ui": {
+        "sidebar_expanded": True,
+        "show_tooltips": True,
+        "animation_enabled": True,
+        "compact_mode": False
+    },
+    "integrations": {
+        "n8n_base_url": "",
+        "api_key": "",
+        "slack_webhook": "",
+        "email_service": "smtp",
+        "smtp_settings": {
+            "host": "",
+            "port": 587,
+            "username": "",
+            "password": "",
+            "use_tls": True
+        }
+    }
+}
+
+SETTINGS_SECTIONS = {
+    "🔗 Webhooks": "render_webhook_settings",
+    "🛠️ Forms": "render_form_settings",
+    "🔐 Security": "render_security_settings",
+    "📊 Analytics": "render_analytics_settings",
+    "🎨 UI/UX": "render_ui_settings",
+    "📱 Integrations": "render_integration_settings"
+}
+
+EXPORT_FORMATS = ("json", "csv", "xlsx")
+EXPORT_FORMAT_IDX = {v: i for i, v in enumerate(EXPORT_FORMATS)}
+
+THEMES = ("light", "dark", "auto")
+THEME_IDX = {v: i for i, v in enumerate(THEMES)}
+
+EMAIL_SERVICES = ("smtp", "sendgrid", "mailgun", "ses")
+EMAIL_SERVICE_IDX = {v: i for i, v in enumerate(EMAIL_SERVICES)}
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_settings_cached(path: str, mtime_ns: int) -> Dict:
+    """Parse the settings file, memoized on its modification time"""
+    with open(path, 'rb') as f:
+        return jsonio.loads(f.read())
 
 class SettingsManager:
+    _data_dir_ready = False
+    
     def __init__(self):
         self.settings_file = "data/app_settings.json"
+        self._dirty = False
         self.ensure_data_dir()
         self.load_settings()
     
     def ensure_data_dir(self):
         """Ensure data directory exists"""
-        os.makedirs("data", exist_ok=True)
+        if not SettingsManager._data_dir_ready:
+            os.makedirs("data", exist_ok=True)
+            SettingsManager._data_dir_ready = True
     
     def load_settings(self):
         """Load application settings"""
         try:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    self.settings = json.load(f)
+                self.settings = _load_settings_cached(
+                    self.settings_file,
+                    os.stat(self.settings_file).st_mtime_ns
+                )
             else:
                 self.settings = self.get_default_settings()
                 self.save_settings()
@@ -32,101 +127,40 @@ class SettingsManager:
     def save_settings(self):
         """Save application settings"""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            with open(self.settings_file, 'wb') as f:
+                f.write(jsonio.dumps(self.settings))
+            self._dirty = False
         except Exception as e:
             st.error(f"Error saving settings: {e}")
     
+    def flush(self):
+        """Save application settings only if they changed since the last save"""
+        if self._dirty:
+            self.save_settings()
+    
+    def _set_section(self, section: str, values: Dict):
+        """Replace a settings section, marking the settings dirty if it changed"""
+        if values != self.settings.get(section):
+            self.settings[section] = values
+            self._dirty = True
+    
     def get_default_settings(self) -> Dict:
         """Get default application settings"""
-        return {
-            "general": {
-                "app_name": "n8n Business Suite",
-                "theme": "light",
-                "auto_save": True,
-                "notifications": True,
-                "language": "en",
-                "timezone": "UTC"
-            },
-            "webhooks": {
-                "timeout": 30,
-                "retry_attempts": 3,
-                "retry_delay": 5,
-                "default_headers": {
-                    "Content-Type": "application/json",
-                    "User-Agent": "n8n-business-suite/1.0"
-                }
-            },
-            "forms": {
-                "max_file_size": 10,  # MB
-                "allowed_file_types": ["pdf", "jpg", "jpeg", "png", "mp3", "wav", "m4a"],
-                "required_field_indicator": "*",
-                "validation_enabled": True
-            },
-            "security": {
-                "enable_csrf": True,
-                "session_timeout": 3600,  # seconds
-                "max_login_attempts": 5,
-                "password_min_length": 8
-            },
-            "analytics": {
-                "track_form_submissions": True,
-                "track_webhook_calls": True,
-                "retention_days": 90,
-                "export_format": "json"
-            },
-            "ui": {
-                "sidebar_expanded": True,
-                "show_tooltips": True,
-                "animation_enabled": True,
-                "compact_mode": False
-            },
-            "integrations": {
-                "n8n_base_url": "",
-                "api_key": "",
-                "slack_webhook": "",
-                "email_service": "smtp",
-                "smtp_settings": {
-                    "host": "",
-                    "port": 587,
-                    "username": "",
-                    "password": "",
-                    "use_tls": True
-                }
-            }
-        }
+        return copy.deepcopy(_DEFAULT_SETTINGS)
     
     def render(self):
         """Render the complete settings interface"""
         st.subheader("⚙️ Application Settings")
         
-        # Settings tabs
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-            "🔗 Webhooks", 
-            "🛠️ Forms", 
-            "🔐 Security", 
-            "📊 Analytics", 
-            "🎨 UI/UX", 
-            "📱 Integrations"
-        ])
-        
-        with tab1:
-            self.render_webhook_settings()
-        
-        with tab2:
-            self.render_form_settings()
-        
-        with tab3:
-            self.render_security_settings()
-        
-        with tab4:
-            self.render_analytics_settings()
-        
-        with tab5:
-            self.render_ui_settings()
-        
-        with tab6:
-            self.render_integration_settings()
+        # Only the selected section's widgets are built on each rerun
+        section = st.radio(
+            "Section",
+            tuple(SETTINGS_SECTIONS),
+            horizontal=True,
+            label_visibility="collapsed",
+            key="settings_section_tab"
+        )
+        getattr(self, SETTINGS_SECTIONS[section])()
         
         # Global actions
         st.markdown("---")
@@ -134,7 +168,7 @@ class SettingsManager:
         
         with col1:
             if st.button("💾 Save All Settings", type="primary"):
-                self.save_settings()
+                self.flush()
                 st.success("✅ Settings saved successfully!")
         
         with col2:
@@ -195,38 +229,27 @@ class SettingsManager:
         st.write("#### Default Headers")
         headers = webhook_settings.get("default_headers", {})
         
-        # Display current headers
-        for key, value in headers.items():
-            col1, col2, col3 = st.columns([2, 3, 1])
-            with col1:
-                st.text_input(f"Header Key", value=key, disabled=True, key=f"header_key_{key}")
-            with col2:
-                new_value = st.text_input(f"Header Value", value=value, key=f"header_value_{key}")
-                headers[key] = new_value
-            with col3:
-                if st.button("🗑️", key=f"delete_header_{key}"):
-                    del headers[key]
-                    st.rerun()
-        
-        # Add new header
-        with st.expander("➕ Add New Header"):
-            col1, col2, col3 = st.columns([2, 3, 1])
-            with col1:
-                new_header_key = st.text_input("New Header Key")
-            with col2:
-                new_header_value = st.text_input("New Header Value")
-            with col3:
-                if st.button("Add") and new_header_key and new_header_value:
-                    headers[new_header_key] = new_header_value
-                    st.rerun()
+        # One editable table instead of a row of widgets per header;
+        # rows can be added and deleted in place
+        edited_headers = st.data_editor(
+            pd.DataFrame(list(headers.items()), columns=["key", "value"]),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="headers_editor"
+        )
+        headers = {
+            key: value
+            for key, value in zip(edited_headers["key"], edited_headers["value"])
+            if key and value is not None
+        }
         
         # Update settings
-        self.settings["webhooks"] = {
+        self._set_section("webhooks", {
             "timeout": timeout,
             "retry_attempts": retry_attempts,
             "retry_delay": retry_delay,
             "default_headers": headers
-        }
+        })
     
     def render_form_settings(self):
         """Render form configuration settings"""
@@ -257,7 +280,7 @@ class SettingsManager:
             )
         
         st.write("#### Allowed File Types")
-        current_types = form_settings.get("allowed_file_types", [])
+        current_types = set(form_settings.get("allowed_file_types", []))
         
         # Common file types
         file_type_options = {
@@ -284,15 +307,15 @@ class SettingsManager:
         )
         
         if custom_types:
-            selected_types.extend([t.strip() for t in custom_types.split(",") if t.strip()])
+            selected_types.extend(t.strip() for t in custom_types.split(",") if t.strip())
         
         # Update settings
-        self.settings["forms"] = {
+        self._set_section("forms", {
             "max_file_size": max_file_size,
-            "allowed_file_types": list(set(selected_types)),
+            "allowed_file_types": list(dict.fromkeys(selected_types)),
             "required_field_indicator": required_indicator,
             "validation_enabled": validation_enabled
-        }
+        })
     
     def render_security_settings(self):
         """Render security configuration settings"""
@@ -332,12 +355,12 @@ class SettingsManager:
             )
         
         # Update settings
-        self.settings["security"] = {
+        self._set_section("security", {
             "enable_csrf": enable_csrf,
             "session_timeout": session_timeout,
             "max_login_attempts": max_login_attempts,
             "password_min_length": password_min_length
-        }
+        })
     
     def render_analytics_settings(self):
         """Render analytics configuration settings"""
@@ -368,17 +391,17 @@ class SettingsManager:
             
             export_format = st.selectbox(
                 "Export Format",
-                ["json", "csv", "xlsx"],
-                index=["json", "csv", "xlsx"].index(analytics_settings.get("export_format", "json"))
+                EXPORT_FORMATS,
+                index=EXPORT_FORMAT_IDX.get(analytics_settings.get("export_format", "json"), 0)
             )
         
         # Update settings
-        self.settings["analytics"] = {
+        self._set_section("analytics", {
             "track_form_submissions": track_submissions,
             "track_webhook_calls": track_webhooks,
             "retention_days": retention_days,
             "export_format": export_format
-        }
+        })
     
     def render_ui_settings(self):
         """Render UI/UX configuration settings"""
@@ -413,24 +436,24 @@ class SettingsManager:
         # Theme selection
         theme = st.selectbox(
             "Theme",
-            ["light", "dark", "auto"],
-            index=["light", "dark", "auto"].index(ui_settings.get("theme", "light"))
+            THEMES,
+            index=THEME_IDX.get(ui_settings.get("theme", "light"), 0)
         )
         
         # Update settings
-        self.settings["ui"] = {
+        self._set_section("ui", {
             "sidebar_expanded": sidebar_expanded,
             "show_tooltips": show_tooltips,
             "animation_enabled": animation_enabled,
             "compact_mode": compact_mode,
             "theme": theme
-        }
+        })
     
     def render_integration_settings(self):
         """Render integration configuration settings"""
         st.write("### 📱 Integration Settings")
         
-        integration_settings = self.settings.get("integrations", {})
+        integration_settings = dict(self.settings.get("integrations", {}))
         
         # n8n Integration
         st.write("#### n8n Integration")
@@ -463,8 +486,8 @@ class SettingsManager:
         st.write("#### Email Integration")
         email_service = st.selectbox(
             "Email Service",
-            ["smtp", "sendgrid", "mailgun", "ses"],
-            index=["smtp", "sendgrid", "mailgun", "ses"].index(integration_settings.get("email_service", "smtp"))
+            EMAIL_SERVICES,
+            index=EMAIL_SERVICE_IDX.get(integration_settings.get("email_service", "smtp"), 0)
         )
         
         if email_service == "smtp":
@@ -489,13 +512,13 @@ class SettingsManager:
             }
         
         # Update settings
-        self.settings["integrations"] = {
+        self._set_section("integrations", {
             **integration_settings,
             "n8n_base_url": n8n_base_url,
             "api_key": api_key,
             "slack_webhook": slack_webhook,
             "email_service": email_service
-        }
+        })
     
     def export_settings(self):
         """Export all settings and data"""
@@ -503,17 +526,28 @@ class SettingsManager:
             # Create a zip file with all data
             zip_buffer = io.BytesIO()
             
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            # The payload is a handful of small JSON files, so skip deflate
+            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zip_file:
                 # Add settings
-                zip_file.writestr("settings.json", json.dumps(self.settings, indent=2))
+                zip_file.writestr("settings.json", jsonio.dumps(self.settings))
+
+                # Forms live in SQLite; back them up in the custom_forms.json layout
+                if os.path.exists("data/forms.db"):
+                    with closing(sqlite3.connect("data/forms.db")) as conn:
+                        rows = conn.execute("SELECT key, config FROM forms ORDER BY rowid").fetchall()
+                    zip_file.writestr(
+                        "custom_forms.json",
+                        jsonio.dumps({key: jsonio.loads(config) for key, config in rows})
+                    )
                 
                 # Add other data files if they exist
-                data_files = ["webhooks.json", "custom_forms.json", "business_models.json"]
+                data_files = ["webhooks.json", "business_models.json", "business_models.jsonl"]
+                if not os.path.exists("data/forms.db"):
+                    data_files.append("custom_forms.json")
                 for file_name in data_files:
                     file_path = f"data/{file_name}"
                     if os.path.exists(file_path):
-                        with open(file_path, 'r') as f:
-                            zip_file.writestr(file_name, f.read())
+                        zip_file.write(file_path, arcname=file_name)
             
             zip_buffer.seek(0)
             
@@ -533,7 +567,7 @@ class SettingsManager:
         try:
             if uploaded_file.name.endswith('.json'):
                 # Single JSON file
-                settings_data = json.load(uploaded_file)
+                settings_data = jsonio.loads(uploaded_file.read())
                 self.settings = settings_data
                 self.save_settings()
                 st.success("✅ Settings imported successfully!")
@@ -544,17 +578,29 @@ class SettingsManager:
                 with zipfile.ZipFile(uploaded_file, 'r') as zip_file:
                     # Extract settings
                     if 'settings.json' in zip_file.namelist():
-                        settings_content = zip_file.read('settings.json')
-                        self.settings = json.loads(settings_content)
+                        self.settings = jsonio.loads(zip_file.read('settings.json'))
                         self.save_settings()
                     
+                    # A restored models snapshot must not pick up a stale local journal
+                    names = zip_file.namelist()
+                    if 'business_models.json' in names and 'business_models.jsonl' not in names:
+                        if os.path.exists("data/business_models.jsonl"):
+                            os.remove("data/business_models.jsonl")
+                    
+                    # Forms live in SQLite: write the restored set straight into the database
+                    if 'custom_forms.json' in names:
+                        replace_forms(jsonio.loads(zip_file.read('custom_forms.json')))
+                    
                     # Extract other data files
-                    for file_name in zip_file.namelist():
-                        if file_name.endswith('.json') and file_name != 'settings.json':
-                            content = zip_file.read(file_name)
-                            with open(f"data/{file_name}", 'w') as f:
-                                f.write(content.decode('utf-8'))
+                    for file_name in names:
+                        if file_name.endswith(('.json', '.jsonl')) and file_name not in ('settings.json', 'custom_forms.json'):
+                            target = f"data/{os.path.basename(file_name)}"
+                            with zip_file.open(file_name) as src, open(target, 'wb') as dst:
+                                shutil.copyfileobj(src, dst, length=65536)
                 
+                # Cached instances would keep serving the pre-import forms and models
+                get_form_builder.clear()
+                st.session_state.pop("_modeler", None)
                 st.success("✅ Complete backup imported successfully!")
                 st.rerun()
             
@@ -569,9 +615,16 @@ class SettingsManager:
         return self.settings.get(category, {}).get(key, default)
     
     def update_setting(self, category: str, key: str, value: Any):
-        """Update a specific setting value"""
+        """Update a specific setting value (persisted on the next flush)"""
         if category not in self.settings:
             self.settings[category] = {}
         self.settings[category][key] = value
-        self.save_settings()
+        self._dirty = True
 
+def get_settings_manager() -> SettingsManager:
+    """Get this browser session's SettingsManager, kept across reruns"""
+    # Per session, not cache_resource: settings edits and _dirty are per user;
+    # the parsed file itself is already shared through _load_settings_cached
+    if "_settings_manager" not in st.session_state:
+        st.session_state["_settings_manager"] = SettingsManager()
+    return st.session_state["_settings_manager"]
@@ -1,17 +1,98 @@
 import streamlit as st
-from streamlit_option_menu import option_menu
+from types import MappingProxyType
+
+# Static sidebar content, built once at import instead of on every rerun
+_HEADER_HTML = """
+<div style="text-align: center; padding: 1rem;">
+    <h2 style="color: #667eea;">🚀 n8n Business Suite</h2>
+    <p style="color: #666; font-size: 0.9rem;">Complete Business Automation</p>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; color: #666; font-size: 0.8rem;">
+    <p>Built with ❤️ using Streamlit</p>
+    <p>Version 1.0.0</p>
+</div>
+"""
+
+_HELP_MARKDOWN = """
+**Getting Started:**
+1. Configure webhooks in Settings
+2. Create forms using Form Builder
+3. Test with examples
+4. Deploy your business processes
+
+**Need Help?**
+- Check the Examples section
+- Use the Business Modeler
+- Test webhooks before deployment
+"""
+
+_SETTINGS_SECTIONS = (
+    "🔗 Webhook Management",
+    "🛠️ Form Configuration",
+    "🔐 Security Settings",
+    "📊 Analytics Setup",
+    "🎨 UI Customization",
+    "📱 Integration Settings",
+    "🔄 Backup & Restore",
+    "📋 Export/Import"
+)
+
+_EXAMPLE_CATEGORIES = MappingProxyType({
+    "📝 Forms": (
+        "Customer Feedback",
+        "Lead Capture",
+        "Appointment Booking",
+        "Support Tickets",
+        "Newsletter Signup"
+    ),
+    "📎 Document Processing": (
+        "Contract Management",
+        "Invoice Processing",
+        "Report Generation",
+        "NDA Handling",
+        "Catalog Management"
+    ),
+    "🎙️ Audio Processing": (
+        "Client Interviews",
+        "Sales Call Analysis",
+        "Pitch Recordings",
+        "Voice Memos",
+        "Training Audio"
+    ),
+    "🖼️ Image Processing": (
+        "Product Photos",
+        "ID Verification",
+        "Logo Management",
+        "Receipt Processing",
+        "Event Documentation"
+    ),
+    "🤖 Automation": (
+        "Customer Support",
+        "Sales Automation",
+        "Booking Systems",
+        "Feedback Collection",
+        "HR Onboarding"
+    ),
+    "🏢 Industry Specific": (
+        "Real Estate CRM",
+        "Healthcare Forms",
+        "E-commerce Tools",
+        "Agency Management",
+        "Restaurant Orders"
+    )
+})
 
 def create_sidebar():
     """Create and render the main navigation sidebar"""
+    # Imported here so the examples/settings sidebars don't pay for it
+    from streamlit_option_menu import option_menu
     
     with st.sidebar:
         # Logo and title
-        st.markdown("""
-        <div style="text-align: center; padding: 1rem;">
-            <h2 style="color: #667eea;">🚀 n8n Business Suite</h2>
-            <p style="color: #666; font-size: 0.9rem;">Complete Business Automation</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
         
         st.markdown("---")
         
@@ -85,88 +166,46 @@ def create_sidebar():
         
         # Help and documentation
         with st.expander("📚 Help & Documentation"):
-            st.markdown("""
-            **Getting Started:**
-            1. Configure webhooks in Settings
-            2. Create forms using Form Builder
-            3. Test with examples
-            4. Deploy your business processes
-            
-            **Need Help?**
-            - Check the Examples section
-            - Use the Business Modeler
-            - Test webhooks before deployment
-            """)
+            st.markdown(_HELP_MARKDOWN)
         
         # Footer
         st.markdown("---")
-        st.markdown("""
-        <div style="text-align: center; color: #666; font-size: 0.8rem;">
-            <p>Built with ❤️ using Streamlit</p>
-            <p>Version 1.0.0</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
     
     return selected
 
+def _pick_example(category: str):
+    """Record the example chosen in one category and clear the others"""
+    item = st.session_state[f"cat_{category}"]
+    for other in _EXAMPLE_CATEGORIES:
+        if other != category:
+            st.session_state[f"cat_{other}"] = ""
+    if item:
+        st.session_state.selected_example = item
+        st.session_state._example_picked = item
+
 def create_examples_sidebar():
     """Create sidebar specifically for examples page"""
     
     with st.sidebar:
         st.header("📁 Business Examples")
         
-        # Categories
-        categories = {
-            "📝 Forms": [
-                "Customer Feedback",
-                "Lead Capture", 
-                "Appointment Booking",
-                "Support Tickets",
-                "Newsletter Signup"
-            ],
-            "📎 Document Processing": [
-                "Contract Management",
-                "Invoice Processing", 
-                "Report Generation",
-                "NDA Handling",
-                "Catalog Management"
-            ],
-            "🎙️ Audio Processing": [
-                "Client Interviews",
-                "Sales Call Analysis",
-                "Pitch Recordings",
-                "Voice Memos",
-                "Training Audio"
-            ],
-            "🖼️ Image Processing": [
-                "Product Photos",
-                "ID Verification", 
-                "Logo Management",
-                "Receipt Processing",
-                "Event Documentation"
-            ],
-            "🤖 Automation": [
-                "Customer Support",
-                "Sales Automation",
-                "Booking Systems", 
-                "Feedback Collection",
-                "HR Onboarding"
-            ],
-            "🏢 Industry Specific": [
-                "Real Estate CRM",
-                "Healthcare Forms",
-                "E-commerce Tools",
-                "Agency Management",
-                "Restaurant Orders"
-            ]
-        }
-        
-        for category, items in categories.items():
+        # One selectbox per category instead of a button per example
+        for category, items in _EXAMPLE_CATEGORIES.items():
             with st.expander(category):
-                for item in items:
-                    if st.button(item, key=f"example_{item.replace(' ', '_').lower()}"):
-                        st.session_state.selected_example = item
-                        return item
+                st.selectbox(
+                    category,
+                    ("",) + items,
+                    key=f"cat_{category}",
+                    label_visibility="collapsed",
+                    on_change=_pick_example,
+                    args=(category,)
+                )
+        
+        # Report a new pick once, as the per-item buttons used to
+        picked = st.session_state.pop("_example_picked", None)
+        if picked:
+            return picked
         
         st.markdown("---")
         
@@ -203,20 +242,9 @@ def create_settings_sidebar():
     with st.sidebar:
         st.header("⚙️ Settings Categories")
         
-        settings_sections = [
-            "🔗 Webhook Management",
-            "🛠️ Form Configuration", 
-            "🔐 Security Settings",
-            "📊 Analytics Setup",
-            "🎨 UI Customization",
-            "📱 Integration Settings",
-            "🔄 Backup & Restore",
-            "📋 Export/Import"
-        ]
-        
         selected_section = st.radio(
             "Select Section",
-            settings_sections,
+            _SETTINGS_SECTIONS,
             key="settings_section"
         )
         
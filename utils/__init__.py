@@ -1,2 +1,6 @@
 # Utils package for n8n Business Suite
+import streamlit as st
 
+# st.fragment lets a page or tab rerun on its own widget changes; older
+# Streamlit releases without it fall back to a plain full-page rerun
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
@@ -1,15 +1,333 @@
 import streamlit as st
-import json
 import os
+import copy
+import math
+from collections import Counter
 from datetime import datetime
 from typing import Dict, List, Any
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+
+from utils import fragment, jsonio
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_models_cached(path: str, mtime_ns: int) -> Dict:
+    """Parse the models file, memoized on its modification time"""
+    with open(path, 'rb') as f:
+        return jsonio.loads(f.read())
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_journal_cached(path: str, mtime_ns: int) -> List:
+    """Parse the appended-models journal, memoized on its modification time"""
+    entries = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                entry = jsonio.loads(line)
+                entries.append((entry['key'], entry['model']))
+            except (ValueError, KeyError, TypeError):
+                # A torn final line from an interrupted append, or an entry
+                # without a key/model; skip it rather than lose the store
+                continue
+    return entries
+
+MODEL_KEY_TIME_FORMAT = '%Y%m%d_%H%M%S'
+
+# Above these sizes the flowchart drops arrowheads / samples nodes so the
+# browser stays responsive
+MAX_ARROW_EDGES = 500
+MAX_RENDERED_NODES = 2000
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_flowchart_fig(title: str, nodes: List[Dict], connections: List[Dict], node_types: Dict,
+                         max_nodes: int = 0):
+    """Build the flowchart figure for a model, memoized on its contents"""
+    import plotly.graph_objects as go
+    
+    # Keep only the most connected nodes when a cap is given
+    if max_nodes and len(nodes) > max_nodes:
+        degree = Counter()
+        for connection in connections:
+            degree[connection['from']] += 1
+            degree[connection['to']] += 1
+        keep_ids = {node_id for node_id, _ in degree.most_common(max_nodes)}
+        nodes = [n for n in nodes if n['id'] in keep_ids][:max_nodes]
+    
+    # Create plotly figure with one trace each for edges, arrowheads
+    # and nodes, rather than one trace/annotation per element
+    fig = go.Figure()
+    
+    # Add connections as a single trace, segments separated by None
+    node_by_id = {n['id']: n for n in nodes}
+    draw_arrows = len(connections) <= MAX_ARROW_EDGES
+    edge_x, edge_y = [], []
+    arrow_x, arrow_y, arrow_angles = [], [], []
+    for connection in connections:
+        from_node = node_by_id.get(connection['from'])
+        to_node = node_by_id.get(connection['to'])
+        
+        if from_node and to_node:
+            x0, y0 = from_node.get('x', 0), from_node.get('y', 0)
+            x1, y1 = to_node.get('x', 0), to_node.get('y', 0)
+            edge_x += [x0, x1, None]
+            edge_y += [y0, y1, None]
+            
+            if not draw_arrows:
+                continue
+            
+            # Arrowhead at the target node; marker angles run clockwise
+            arrow_x.append(x1)
+            arrow_y.append(y1)
+            arrow_angles.append(-math.degrees(math.atan2(y1 - y0, x1 - x0)))
+    
+    fig.add_trace(go.Scatter(
+        x=edge_x,
+        y=edge_y,
+        mode='lines',
+        line=dict(width=2, color='gray'),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    if arrow_x:
+        fig.add_trace(go.Scatter(
+            x=arrow_x,
+            y=arrow_y,
+            mode='markers',
+            marker=dict(symbol='triangle-right', size=12, color='gray', angle=arrow_angles, standoff=20),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+    
+    # Add nodes as a single trace
+    node_x, node_y, node_colors, node_icons, node_hovers = [], [], [], [], []
+    for node in nodes:
+        node_type = node.get('type', 'action')
+        node_info = node_types.get(node_type, node_types['action'])
+        x, y = node.get('x', 0), node.get('y', 0)
+        
+        node_x.append(x)
+        node_y.append(y)
+        node_colors.append(node_info['color'])
+        node_icons.append(node_info['icon'])
+        node_hovers.append(
+            f"<b>{node.get('label', node.get('id'))}</b><br>"
+            f"Type: {node_info['description']}<br>"
+            f"Position: ({x}, {y})"
+        )
+    
+    fig.add_trace(go.Scatter(
+        x=node_x,
+        y=node_y,
+        mode='markers+text',
+        marker=dict(
+            size=40,
+            color=node_colors,
+            line=dict(width=2, color='white')
+        ),
+        text=node_icons,
+        textfont=dict(size=20),
+        hovertext=node_hovers,
+        hoverinfo='text',
+        showlegend=False
+    ))
+    
+    # Update layout
+    fig.update_layout(
+        title=f"Process Flow: {title}",
+        showlegend=False,
+        hovermode='closest',
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        uirevision='const'
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_pie_fig(names: tuple, values: tuple, title: str):
+    """Build a pie chart, memoized on its data"""
+    import plotly.express as px
+    
+    return px.pie(values=list(values), names=list(names), title=title)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_bar_fig(x: tuple, y: tuple, title: str, x_label: str, y_label: str):
+    """Build a bar chart, memoized on its data"""
+    import plotly.express as px
+    
+    return px.bar(x=list(x), y=list(y), title=title, labels={'x': x_label, 'y': y_label})
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_complexity_fig(model_signatures: tuple):
+    """Build the nodes/connections per model chart from (name, nodes, connections) tuples"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    model_names = [name for name, _, _ in model_signatures]
+    node_counts = [n_nodes for _, n_nodes, _ in model_signatures]
+    connection_counts = [n_conns for _, _, n_conns in model_signatures]
+    
+    fig_complexity = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Nodes per Model', 'Connections per Model'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}]]
+    )
+    
+    fig_complexity.add_trace(
+        go.Bar(x=model_names, y=node_counts, name="Nodes", marker_color='lightblue'),
+        row=1, col=1
+    )
+    
+    fig_complexity.add_trace(
+        go.Bar(x=model_names, y=connection_counts, name="Connections", marker_color='lightcoral'),
+        row=1, col=2
+    )
+    
+    fig_complexity.update_layout(height=400, showlegend=False)
+    return fig_complexity
+
+# Seed models written on first run; copied before use so callers can mutate freely
+DEFAULT_MODELS = {
+    "lead_capture_model": {
+        "name": "Lead Capture Process",
+        "description": "Complete lead capture and nurturing workflow",
+        "type": "lead_generation",
+        "nodes": [
+            {"id": "start", "type": "trigger", "label": "Website Visit", "x": 100, "y": 100},
+            {"id": "form", "type": "form", "label": "Contact Form", "x": 250, "y": 100},
+            {"id": "webhook", "type": "webhook", "label": "Send to CRM", "x": 400, "y": 100},
+            {"id": "email", "type": "notification", "label": "Welcome Email", "x": 550, "y": 100},
+            {"id": "condition", "type": "condition", "label": "Qualified Lead?", "x": 400, "y": 250},
+            {"id": "sales_notify", "type": "notification", "label": "Notify Sales", "x": 550, "y": 200},
+            {"id": "nurture", "type": "action", "label": "Add to Nurture", "x": 550, "y": 300},
+            {"id": "end", "type": "end", "label": "Process Complete", "x": 700, "y": 250}
+        ],
+        "connections": [
+            {"from": "start", "to": "form"},
+            {"from": "form", "to": "webhook"},
+            {"from": "webhook", "to": "email"},
+            {"from": "email", "to": "condition"},
+            {"from": "condition", "to": "sales_notify", "condition": "qualified"},
+            {"from": "condition", "to": "nurture", "condition": "not_qualified"},
+            {"from": "sales_notify", "to": "end"},
+            {"from": "nurture", "to": "end"}
+        ],
+        "webhooks": ["lead_capture", "crm_integration"],
+        "forms": ["contact_form"],
+        "created_at": "2024-01-01T00:00:00Z"
+    },
+    "support_ticket_model": {
+        "name": "Support Ticket Workflow",
+        "description": "Customer support ticket processing and resolution",
+        "type": "support_workflow",
+        "nodes": [
+            {"id": "ticket_created", "type": "trigger", "label": "Ticket Created", "x": 100, "y": 100},
+            {"id": "categorize", "type": "condition", "label": "Categorize Issue", "x": 250, "y": 100},
+            {"id": "urgent", "type": "action", "label": "Urgent Queue", "x": 400, "y": 50},
+            {"id": "normal", "type": "action", "label": "Normal Queue", "x": 400, "y": 150},
+            {"id": "auto_response", "type": "notification", "label": "Auto Response", "x": 550, "y": 100},
+            {"id": "assign", "type": "action", "label": "Assign Agent", "x": 700, "y": 100},
+            {"id": "resolved", "type": "condition", "label": "Resolved?", "x": 850, "y": 100},
+            {"id": "close", "type": "action", "label": "Close Ticket", "x": 1000, "y": 50},
+            {"id": "escalate", "type": "action", "label": "Escalate", "x": 1000, "y": 150},
+            {"id": "end", "type": "end", "label": "Complete", "x": 1150, "y": 100}
+        ],
+        "connections": [
+            {"from": "ticket_created", "to": "categorize"},
+            {"from": "categorize", "to": "urgent", "condition": "high_priority"},
+            {"from": "categorize", "to": "normal", "condition": "normal_priority"},
+            {"from": "urgent", "to": "auto_response"},
+            {"from": "normal", "to": "auto_response"},
+            {"from": "auto_response", "to": "assign"},
+            {"from": "assign", "to": "resolved"},
+            {"from": "resolved", "to": "close", "condition": "yes"},
+            {"from": "resolved", "to": "escalate", "condition": "no"},
+            {"from": "close", "to": "end"},
+            {"from": "escalate", "to": "end"}
+        ],
+        "webhooks": ["support_ticket", "agent_notification"],
+        "forms": ["support_form"],
+        "created_at": "2024-01-01T00:00:00Z"
+    }
+}
+
+# Static template catalogue shown in the Templates tab
+TEMPLATES = {
+    "lead_generation": {
+        "name": "Lead Generation Workflow",
+        "description": "Complete lead capture, qualification, and nurturing process",
+        "complexity": "Intermediate",
+        "estimated_time": "30 minutes",
+        "includes": ["Contact forms", "CRM integration", "Email automation", "Lead scoring"]
+    },
+    "customer_support": {
+        "name": "Customer Support Process",
+        "description": "Ticket creation, routing, escalation, and resolution workflow",
+        "complexity": "Advanced",
+        "estimated_time": "45 minutes",
+        "includes": ["Ticket forms", "Auto-routing", "SLA tracking", "Customer notifications"]
+    },
+    "sales_pipeline": {
+        "name": "Sales Pipeline Management",
+        "description": "Opportunity tracking from lead to close",
+        "complexity": "Advanced",
+        "estimated_time": "60 minutes",
+        "includes": ["Opportunity forms", "Stage progression", "Sales notifications", "Reporting"]
+    },
+    "onboarding": {
+        "name": "Customer Onboarding",
+        "description": "New customer welcome and setup process",
+        "complexity": "Intermediate",
+        "estimated_time": "40 minutes",
+        "includes": ["Welcome forms", "Account setup", "Training materials", "Check-ins"]
+    },
+    "content_approval": {
+        "name": "Content Approval Workflow",
+        "description": "Content creation, review, approval, and publishing process",
+        "complexity": "Beginner",
+        "estimated_time": "20 minutes",
+        "includes": ["Submission forms", "Review process", "Approval routing", "Publishing"]
+    },
+    "invoice_processing": {
+        "name": "Invoice Processing",
+        "description": "Invoice receipt, validation, approval, and payment workflow",
+        "complexity": "Intermediate",
+        "estimated_time": "35 minutes",
+        "includes": ["Invoice upload", "Data extraction", "Approval workflow", "Payment processing"]
+    }
+}
+
+COMPLEXITY_COLOR = {
+    "Beginner": "🟢",
+    "Intermediate": "🟡",
+    "Advanced": "🔴"
+}
+
+@fragment
+def _gallery_fragment(modeler: "BusinessModeler"):
+    """Render the gallery tab as an independently rerunning fragment"""
+    modeler.render_model_gallery()
+
+@fragment
+def _creator_fragment(modeler: "BusinessModeler"):
+    """Render the creator tab as an independently rerunning fragment"""
+    modeler.render_model_creator()
+
+@fragment
+def _analytics_fragment(modeler: "BusinessModeler"):
+    """Render the analytics tab as an independently rerunning fragment"""
+    modeler.render_model_analytics()
+
+@fragment
+def _templates_fragment(modeler: "BusinessModeler"):
+    """Render the templates tab as an independently rerunning fragment"""
+    modeler.render_model_templates()
 
 class BusinessModeler:
     def __init__(self):
         self.models_file = "data/business_models.json"
+        self.journal_file = "data/business_models.jsonl"
         self.ensure_data_dir()
         self.load_models()
         self.process_types = {
@@ -22,6 +340,7 @@ class BusinessModeler:
             "hr_onboarding": "HR Onboarding",
             "project_management": "Project Management"
         }
+        self.process_types_reverse = {v: k for k, v in self.process_types.items()}
         
         self.node_types = {
             "trigger": {"icon": "🚀", "color": "#4CAF50", "description": "Process trigger/start"},
@@ -41,90 +360,61 @@ class BusinessModeler:
     
     def load_models(self):
         """Load business models from file"""
+        if getattr(self, 'models', None) is not None:
+            return
         try:
             if os.path.exists(self.models_file):
-                with open(self.models_file, 'r') as f:
-                    self.models = json.load(f)
+                self.models = _load_models_cached(
+                    self.models_file,
+                    os.stat(self.models_file).st_mtime_ns
+                )
             else:
                 self.models = self.get_default_models()
                 self.save_models()
+            
+            # Replay models appended since the last full save
+            if os.path.exists(self.journal_file):
+                self.models.update(_load_journal_cached(
+                    self.journal_file,
+                    os.stat(self.journal_file).st_mtime_ns
+                ))
         except Exception as e:
             st.error(f"Error loading models: {e}")
             self.models = self.get_default_models()
     
     def save_models(self):
         """Save business models to file"""
+        # Write to a temp file and swap it in so a rerun mid-write never
+        # leaves a truncated models file behind
+        tmp_file = self.models_file + '.tmp'
         try:
-            with open(self.models_file, 'w') as f:
-                json.dump(self.models, f, indent=2)
+            with open(tmp_file, 'wb') as f:
+                f.write(jsonio.dumps(self.models, indent=True))
+            os.replace(tmp_file, self.models_file)
+            # The snapshot now holds every appended model
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            _load_models_cached.clear()
+            _load_journal_cached.clear()
         except Exception as e:
             st.error(f"Error saving models: {e}")
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    
+    def append_model(self, model_key: str, model: Dict):
+        """Add a model by appending it to the journal instead of rewriting every model"""
+        self.models[model_key] = model
+        try:
+            with open(self.journal_file, 'ab') as f:
+                f.write(jsonio.dumps({"key": model_key, "model": model}) + b"\n")
+            _load_journal_cached.clear()
+        except Exception as e:
+            st.error(f"Error saving model: {e}")
     
     def get_default_models(self) -> Dict:
         """Get default business process models"""
-        return {
-            "lead_capture_model": {
-                "name": "Lead Capture Process",
-                "description": "Complete lead capture and nurturing workflow",
-                "type": "lead_generation",
-                "nodes": [
-                    {"id": "start", "type": "trigger", "label": "Website Visit", "x": 100, "y": 100},
-                    {"id": "form", "type": "form", "label": "Contact Form", "x": 250, "y": 100},
-                    {"id": "webhook", "type": "webhook", "label": "Send to CRM", "x": 400, "y": 100},
-                    {"id": "email", "type": "notification", "label": "Welcome Email", "x": 550, "y": 100},
-                    {"id": "condition", "type": "condition", "label": "Qualified Lead?", "x": 400, "y": 250},
-                    {"id": "sales_notify", "type": "notification", "label": "Notify Sales", "x": 550, "y": 200},
-                    {"id": "nurture", "type": "action", "label": "Add to Nurture", "x": 550, "y": 300},
-                    {"id": "end", "type": "end", "label": "Process Complete", "x": 700, "y": 250}
-                ],
-                "connections": [
-                    {"from": "start", "to": "form"},
-                    {"from": "form", "to": "webhook"},
-                    {"from": "webhook", "to": "email"},
-                    {"from": "email", "to": "condition"},
-                    {"from": "condition", "to": "sales_notify", "condition": "qualified"},
-                    {"from": "condition", "to": "nurture", "condition": "not_qualified"},
-                    {"from": "sales_notify", "to": "end"},
-                    {"from": "nurture", "to": "end"}
-                ],
-                "webhooks": ["lead_capture", "crm_integration"],
-                "forms": ["contact_form"],
-                "created_at": "2024-01-01T00:00:00Z"
-            },
-            "support_ticket_model": {
-                "name": "Support Ticket Workflow",
-                "description": "Customer support ticket processing and resolution",
-                "type": "support_workflow",
-                "nodes": [
-                    {"id": "ticket_created", "type": "trigger", "label": "Ticket Created", "x": 100, "y": 100},
-                    {"id": "categorize", "type": "condition", "label": "Categorize Issue", "x": 250, "y": 100},
-                    {"id": "urgent", "type": "action", "label": "Urgent Queue", "x": 400, "y": 50},
-                    {"id": "normal", "type": "action", "label": "Normal Queue", "x": 400, "y": 150},
-                    {"id": "auto_response", "type": "notification", "label": "Auto Response", "x": 550, "y": 100},
-                    {"id": "assign", "type": "action", "label": "Assign Agent", "x": 700, "y": 100},
-                    {"id": "resolved", "type": "condition", "label": "Resolved?", "x": 850, "y": 100},
-                    {"id": "close", "type": "action", "label": "Close Ticket", "x": 1000, "y": 50},
-                    {"id": "escalate", "type": "action", "label": "Escalate", "x": 1000, "y": 150},
-                    {"id": "end", "type": "end", "label": "Complete", "x": 1150, "y": 100}
-                ],
-                "connections": [
-                    {"from": "ticket_created", "to": "categorize"},
-                    {"from": "categorize", "to": "urgent", "condition": "high_priority"},
-                    {"from": "categorize", "to": "normal", "condition": "normal_priority"},
-                    {"from": "urgent", "to": "auto_response"},
-                    {"from": "normal", "to": "auto_response"},
-                    {"from": "auto_response", "to": "assign"},
-                    {"from": "assign", "to": "resolved"},
-                    {"from": "resolved", "to": "close", "condition": "yes"},
-                    {"from": "resolved", "to": "escalate", "condition": "no"},
-                    {"from": "close", "to": "end"},
-                    {"from": "escalate", "to": "end"}
-                ],
-                "webhooks": ["support_ticket", "agent_notification"],
-                "forms": ["support_form"],
-                "created_at": "2024-01-01T00:00:00Z"
-            }
-        }
+        return copy.deepcopy(DEFAULT_MODELS)
     
     def render(self):
         """Render the business modeler interface"""
@@ -138,16 +428,16 @@ class BusinessModeler:
         ])
         
         with tab1:
-            self.render_model_gallery()
+            _gallery_fragment(self)
         
         with tab2:
-            self.render_model_creator()
+            _creator_fragment(self)
         
         with tab3:
-            self.render_model_analytics()
+            _analytics_fragment(self)
         
         with tab4:
-            self.render_model_templates()
+            _templates_fragment(self)
     
     def render_model_gallery(self):
         """Render existing models gallery"""
@@ -178,156 +468,118 @@ class BusinessModeler:
                 ["Grid", "List", "Detailed"]
             )
         
+        # Apply deletions confirmed by a card's Delete callback before any card
+        # is drawn; self.models is shared through the cached modeler
+        deleted = [k for k in self.models if st.session_state.pop(f'deleted_{k}', False)]
+        if deleted:
+            for model_key in deleted:
+                del self.models[model_key]
+            self.save_models()
+        
         # Display models
-        filtered_models = self.models
-        if process_filter != "All":
-            process_key = [k for k, v in self.process_types.items() if v == process_filter][0]
-            filtered_models = {k: v for k, v in self.models.items() if v.get("type") == process_key}
+        process_key = self.process_types_reverse.get(process_filter)
+        filtered_items = (
+            item for item in self.models.items()
+            if process_filter == "All" or item[1].get("type") == process_key
+        )
         
         if view_mode == "Grid":
             cols = st.columns(2)
-            for i, (model_key, model) in enumerate(filtered_models.items()):
+            for i, (model_key, model) in enumerate(filtered_items):
                 with cols[i % 2]:
                     self.render_model_card(model_key, model)
         
         elif view_mode == "List":
-            for model_key, model in filtered_models.items():
+            for model_key, model in filtered_items:
                 with st.expander(f"📋 {model.get('name', model_key)}"):
                     self.render_model_details(model_key, model)
         
         else:  # Detailed
-            for model_key, model in filtered_models.items():
+            for model_key, model in filtered_items:
                 st.markdown("---")
                 self.render_model_detailed(model_key, model)
     
+    def _toggle_view(self, model_key: str):
+        """View button callback: show this model's flowchart, or hide it if shown"""
+        if st.session_state.get('selected_model') == model_key:
+            st.session_state.selected_model = None
+        else:
+            st.session_state.selected_model = model_key
+    
+    def _confirm_delete(self, model_key: str, name: str):
+        """Delete button callback: arm on the first click, mark deleted on the second"""
+        if st.session_state.pop(f'confirm_delete_{model_key}', False):
+            # Callbacks run before the rerun, so the gallery drops the model
+            # before drawing its card
+            st.session_state[f'deleted_{model_key}'] = True
+            st.toast(f"Deleted model: {name}")
+        else:
+            st.session_state[f'confirm_delete_{model_key}'] = True
+    
     def render_model_card(self, model_key: str, model: Dict):
         """Render a model card"""
+        nodes = model.get('nodes') or []
+        connections = model.get('connections') or []
+        
         with st.container():
-            st.markdown(f"""
-            <div style="
-                border: 1px solid #ddd; 
-                border-radius: 10px; 
-                padding: 1rem; 
-                margin: 0.5rem 0;
-                background: white;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            ">
-                <h4 style="margin: 0 0 0.5rem 0; color: #333;">
-                    📋 {model.get('name', model_key)}
-                </h4>
-                <p style="margin: 0 0 0.5rem 0; color: #666; font-size: 0.9rem;">
-                    {model.get('description', 'No description')}
-                </p>
-                <p style="margin: 0; color: #888; font-size: 0.8rem;">
-                    Type: {self.process_types.get(model.get('type', ''), 'Unknown')}
-                </p>
-                <p style="margin: 0; color: #888; font-size: 0.8rem;">
-                    Nodes: {len(model.get('nodes', []))} | 
-                    Connections: {len(model.get('connections', []))}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(f"#### 📋 {model.get('name', model_key)}")
+            st.caption(model.get('description', 'No description'))
+            st.caption(
+                f"Type: {self.process_types.get(model.get('type', ''), 'Unknown')} · "
+                f"Nodes: {len(nodes)} · "
+                f"Connections: {len(connections)}"
+            )
             
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                if st.button("👁️ View", key=f"view_{model_key}"):
-                    st.session_state.selected_model = model_key
-                    self.render_model_visualization(model)
+                st.button("👁️ View", key=f"view_{model_key}", on_click=self._toggle_view, args=(model_key,))
             
             with col2:
                 if st.button("✏️ Edit", key=f"edit_{model_key}"):
                     st.session_state.editing_model = model_key
             
             with col3:
-                if st.button("🗑️ Delete", key=f"delete_{model_key}"):
-                    if st.session_state.get(f'confirm_delete_{model_key}', False):
-                        del self.models[model_key]
-                        self.save_models()
-                        st.success(f"Deleted model: {model.get('name', model_key)}")
-                        st.rerun()
-                    else:
-                        st.session_state[f'confirm_delete_{model_key}'] = True
-                        st.warning("Click again to confirm deletion")
+                st.button(
+                    "🗑️ Delete",
+                    key=f"delete_{model_key}",
+                    on_click=self._confirm_delete,
+                    args=(model_key, model.get('name', model_key))
+                )
+                if st.session_state.get(f'confirm_delete_{model_key}'):
+                    st.warning("Click again to confirm deletion")
+            
+            # Drawn from session state so widgets inside the chart (the node
+            # cap checkbox) keep it open across their own reruns
+            if st.session_state.get('selected_model') == model_key:
+                self.render_model_visualization(model_key, model)
     
-    def render_model_visualization(self, model: Dict):
+    def render_model_visualization(self, model_key: str, model: Dict):
         """Render model as a flowchart visualization"""
         st.subheader(f"📊 {model.get('name', 'Business Model')}")
         
-        nodes = model.get('nodes', [])
-        connections = model.get('connections', [])
+        nodes = model.get('nodes') or []
+        connections = model.get('connections') or []
         
         if not nodes:
             st.warning("No nodes defined in this model")
             return
         
-        # Create plotly figure
-        fig = go.Figure()
-        
-        # Add nodes
-        for node in nodes:
-            node_type = node.get('type', 'action')
-            node_info = self.node_types.get(node_type, self.node_types['action'])
-            
-            fig.add_trace(go.Scatter(
-                x=[node.get('x', 0)],
-                y=[node.get('y', 0)],
-                mode='markers+text',
-                marker=dict(
-                    size=40,
-                    color=node_info['color'],
-                    line=dict(width=2, color='white')
-                ),
-                text=node_info['icon'],
-                textfont=dict(size=20),
-                name=node.get('label', node.get('id', 'Node')),
-                hovertemplate=f"<b>{node.get('label', node.get('id'))}</b><br>" +
-                             f"Type: {node_info['description']}<br>" +
-                             f"Position: ({node.get('x', 0)}, {node.get('y', 0)})<extra></extra>"
-            ))
-        
-        # Add connections
-        for connection in connections:
-            from_node = next((n for n in nodes if n['id'] == connection['from']), None)
-            to_node = next((n for n in nodes if n['id'] == connection['to']), None)
-            
-            if from_node and to_node:
-                fig.add_trace(go.Scatter(
-                    x=[from_node.get('x', 0), to_node.get('x', 0)],
-                    y=[from_node.get('y', 0), to_node.get('y', 0)],
-                    mode='lines',
-                    line=dict(width=2, color='gray'),
-                    showlegend=False,
-                    hoverinfo='skip'
-                ))
-                
-                # Add arrow annotation
-                fig.add_annotation(
-                    x=to_node.get('x', 0),
-                    y=to_node.get('y', 0),
-                    ax=from_node.get('x', 0),
-                    ay=from_node.get('y', 0),
-                    xref='x',
-                    yref='y',
-                    axref='x',
-                    ayref='y',
-                    arrowhead=2,
-                    arrowsize=1,
-                    arrowwidth=2,
-                    arrowcolor='gray'
-                )
-        
-        # Update layout
-        fig.update_layout(
-            title=f"Process Flow: {model.get('name', 'Business Model')}",
-            showlegend=True,
-            hovermode='closest',
-            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            plot_bgcolor='rgba(0,0,0,0)',
-            height=600
+        max_nodes = 0
+        if len(nodes) > MAX_RENDERED_NODES:
+            show_all = st.checkbox(
+                f"Show all {len(nodes)} nodes (only the {MAX_RENDERED_NODES} most connected are drawn)",
+                key=f"show_all_nodes_{model_key}"
+            )
+            max_nodes = 0 if show_all else MAX_RENDERED_NODES
+        
+        fig = _build_flowchart_fig(
+            model.get('name', 'Business Model'),
+            nodes,
+            connections,
+            self.node_types,
+            max_nodes
         )
-        
         st.plotly_chart(fig, use_container_width=True)
         
         # Model details
@@ -344,16 +596,13 @@ class BusinessModeler:
         
         # Node types breakdown
         st.subheader("📊 Node Types Breakdown")
-        node_type_counts = {}
-        for node in nodes:
-            node_type = node.get('type', 'action')
-            node_type_counts[node_type] = node_type_counts.get(node_type, 0) + 1
+        node_type_counts = Counter(node.get('type', 'action') for node in nodes)
         
         if node_type_counts:
-            fig_pie = px.pie(
-                values=list(node_type_counts.values()),
-                names=[self.node_types.get(nt, {}).get('description', nt) for nt in node_type_counts.keys()],
-                title="Node Types Distribution"
+            fig_pie = _build_pie_fig(
+                tuple(self.node_types.get(nt, {}).get('description', nt) for nt in node_type_counts.keys()),
+                tuple(node_type_counts.values()),
+                "Node Types Distribution"
             )
             st.plotly_chart(fig_pie, use_container_width=True)
     
@@ -457,8 +706,7 @@ class BusinessModeler:
                         "created_at": datetime.now().isoformat()
                     }
                     
-                    self.models[model_key] = new_model
-                    self.save_models()
+                    self.append_model(model_key, new_model)
                     
                     # Clear session state
                     st.session_state.model_nodes = []
@@ -477,10 +725,27 @@ class BusinessModeler:
             st.info("No models available for analysis. Create some models first.")
             return
         
-        # Overall statistics
+        # Aggregate all statistics in a single pass over the models
         total_models = len(self.models)
-        total_nodes = sum(len(model.get('nodes', [])) for model in self.models.values())
-        total_connections = sum(len(model.get('connections', [])) for model in self.models.values())
+        total_nodes = 0
+        total_connections = 0
+        type_counts = Counter()
+        node_type_usage = Counter()
+        model_signatures = []
+        
+        for model_key, model in self.models.items():
+            nodes = model.get('nodes') or []
+            connections = model.get('connections') or []
+            n_nodes = len(nodes)
+            n_connections = len(connections)
+            
+            total_nodes += n_nodes
+            total_connections += n_connections
+            model_signatures.append((model.get('name', model_key), n_nodes, n_connections))
+            
+            model_type = model.get('type', 'unknown')
+            type_counts[self.process_types.get(model_type, model_type)] += 1
+            node_type_usage.update(node.get('type', 'action') for node in nodes)
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -500,67 +765,30 @@ class BusinessModeler:
         # Process type distribution
         st.subheader("📊 Process Type Distribution")
         
-        type_counts = {}
-        for model in self.models.values():
-            model_type = model.get('type', 'unknown')
-            type_name = self.process_types.get(model_type, model_type)
-            type_counts[type_name] = type_counts.get(type_name, 0) + 1
-        
         if type_counts:
-            fig_bar = px.bar(
-                x=list(type_counts.keys()),
-                y=list(type_counts.values()),
-                title="Models by Process Type",
-                labels={'x': 'Process Type', 'y': 'Number of Models'}
+            fig_bar = _build_bar_fig(
+                tuple(type_counts.keys()),
+                tuple(type_counts.values()),
+                "Models by Process Type",
+                'Process Type',
+                'Number of Models'
             )
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # Model complexity analysis
         st.subheader("📈 Model Complexity Analysis")
         
-        model_names = []
-        node_counts = []
-        connection_counts = []
-        
-        for model_key, model in self.models.items():
-            model_names.append(model.get('name', model_key))
-            node_counts.append(len(model.get('nodes', [])))
-            connection_counts.append(len(model.get('connections', [])))
-        
-        fig_complexity = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=('Nodes per Model', 'Connections per Model'),
-            specs=[[{"secondary_y": False}, {"secondary_y": False}]]
-        )
-        
-        fig_complexity.add_trace(
-            go.Bar(x=model_names, y=node_counts, name="Nodes", marker_color='lightblue'),
-            row=1, col=1
-        )
-        
-        fig_complexity.add_trace(
-            go.Bar(x=model_names, y=connection_counts, name="Connections", marker_color='lightcoral'),
-            row=1, col=2
-        )
-        
-        fig_complexity.update_layout(height=400, showlegend=False)
+        fig_complexity = _build_complexity_fig(tuple(model_signatures))
         st.plotly_chart(fig_complexity, use_container_width=True)
         
         # Node type usage
         st.subheader("🔧 Node Type Usage")
         
-        node_type_usage = {}
-        for model in self.models.values():
-            for node in model.get('nodes', []):
-                node_type = node.get('type', 'action')
-                type_name = self.node_types.get(node_type, {}).get('description', node_type)
-                node_type_usage[type_name] = node_type_usage.get(type_name, 0) + 1
-        
         if node_type_usage:
-            fig_usage = px.pie(
-                values=list(node_type_usage.values()),
-                names=list(node_type_usage.keys()),
-                title="Node Type Usage Distribution"
+            fig_usage = _build_pie_fig(
+                tuple(self.node_types.get(nt, {}).get('description', nt) for nt in node_type_usage.keys()),
+                tuple(node_type_usage.values()),
+                "Node Type Usage Distribution"
             )
             st.plotly_chart(fig_usage, use_container_width=True)
     
@@ -568,53 +796,8 @@ class BusinessModeler:
         """Render model templates and quick start options"""
         st.write("### 📋 Business Model Templates")
         
-        templates = {
-            "lead_generation": {
-                "name": "Lead Generation Workflow",
-                "description": "Complete lead capture, qualification, and nurturing process",
-                "complexity": "Intermediate",
-                "estimated_time": "30 minutes",
-                "includes": ["Contact forms", "CRM integration", "Email automation", "Lead scoring"]
-            },
-            "customer_support": {
-                "name": "Customer Support Process",
-                "description": "Ticket creation, routing, escalation, and resolution workflow",
-                "complexity": "Advanced",
-                "estimated_time": "45 minutes",
-                "includes": ["Ticket forms", "Auto-routing", "SLA tracking", "Customer notifications"]
-            },
-            "sales_pipeline": {
-                "name": "Sales Pipeline Management",
-                "description": "Opportunity tracking from lead to close",
-                "complexity": "Advanced",
-                "estimated_time": "60 minutes",
-                "includes": ["Opportunity forms", "Stage progression", "Sales notifications", "Reporting"]
-            },
-            "onboarding": {
-                "name": "Customer Onboarding",
-                "description": "New customer welcome and setup process",
-                "complexity": "Intermediate",
-                "estimated_time": "40 minutes",
-                "includes": ["Welcome forms", "Account setup", "Training materials", "Check-ins"]
-            },
-            "content_approval": {
-                "name": "Content Approval Workflow",
-                "description": "Content creation, review, approval, and publishing process",
-                "complexity": "Beginner",
-                "estimated_time": "20 minutes",
-                "includes": ["Submission forms", "Review process", "Approval routing", "Publishing"]
-            },
-            "invoice_processing": {
-                "name": "Invoice Processing",
-                "description": "Invoice receipt, validation, approval, and payment workflow",
-                "complexity": "Intermediate",
-                "estimated_time": "35 minutes",
-                "includes": ["Invoice upload", "Data extraction", "Approval workflow", "Payment processing"]
-            }
-        }
-        
         # Template cards
-        for template_key, template in templates.items():
+        for template_key, template in TEMPLATES.items():
             with st.expander(f"📋 {template['name']} - {template['complexity']}"):
                 col1, col2 = st.columns([2, 1])
                 
@@ -626,12 +809,7 @@ class BusinessModeler:
                         st.write(f"  • {item}")
                 
                 with col2:
-                    complexity_color = {
-                        "Beginner": "🟢",
-                        "Intermediate": "🟡", 
-                        "Advanced": "🔴"
-                    }
-                    st.write(f"**Complexity:** {complexity_color.get(template['complexity'], '⚪')} {template['complexity']}")
+                    st.write(f"**Complexity:** {COMPLEXITY_COLOR.get(template['complexity'], '⚪')} {template['complexity']}")
                     
                     if st.button(f"🚀 Use Template", key=f"template_{template_key}"):
                         self.create_from_template(template_key, template)
@@ -680,7 +858,9 @@ class BusinessModeler:
             }
         }
         
-        model_key = f"{template_key}_model_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # One clock read for both the key suffix and created_at
+        now = datetime.now()
+        model_key = f"{template_key}_model_{now.strftime(MODEL_KEY_TIME_FORMAT)}"
         
         new_model = {
             "name": template['name'],
@@ -690,12 +870,11 @@ class BusinessModeler:
             "connections": template_models.get(template_key, {}).get('connections', []),
             "webhooks": [],
             "forms": [],
-            "created_at": datetime.now().isoformat(),
+            "created_at": now.isoformat(),
             "template": template_key
         }
         
-        self.models[model_key] = new_model
-        self.save_models()
+        self.append_model(model_key, new_model)
     
     def get_model(self, model_key: str) -> Dict:
         """Get specific model"""
@@ -705,3 +884,10 @@ class BusinessModeler:
         """Get all models"""
         return self.models
 
+def get_modeler() -> BusinessModeler:
+    """Get this browser session's BusinessModeler, kept across reruns"""
+    # Per session, not cache_resource: gallery deletes mutate self.models;
+    # the parsed file itself is already shared through _load_models_cached
+    if "_modeler" not in st.session_state:
+        st.session_state["_modeler"] = BusinessModeler()
+    return st.session_state["_modeler"]
@@ -1,166 +1,327 @@
 import streamlit as st
-import json
 from datetime import datetime, date
 from typing import Dict, List, Any, Union
 import os
+import copy
+import sqlite3
+from contextlib import closing
+from types import MappingProxyType
+from collections import namedtuple
+from jsonschema import Draft7Validator
+
+from utils import fragment, jsonio
+
+# Keeps the row (and so the form's display order) when a form is updated
+_UPSERT_FORM = (
+    "INSERT INTO forms(key, config) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET config = excluded.config"
+)
+# Marks the forms table as seeded, so an emptied table is not re-seeded
+_MARK_SEEDED = "INSERT OR REPLACE INTO meta(key, value) VALUES ('seeded', ?)"
+
+def connect_forms_db(path: str = "data/forms.db") -> sqlite3.Connection:
+    """Open the forms database in WAL mode"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS forms(key TEXT PRIMARY KEY, config BLOB NOT NULL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+def replace_forms(forms: Dict, path: str = "data/forms.db"):
+    """Replace every stored form in one transaction"""
+    with closing(connect_forms_db(path)) as conn, conn:
+        conn.execute("DELETE FROM forms")
+        conn.executemany(_UPSERT_FORM, [(key, jsonio.dumps(config)) for key, config in forms.items()])
+        conn.execute(_MARK_SEEDED, (datetime.now().isoformat(),))
+
+FIELD_TYPES = MappingProxyType({
+    "text": "Text Input",
+    "email": "Email Input",
+    "number": "Number Input",
+    "textarea": "Text Area",
+    "select": "Select Dropdown",
+    "multiselect": "Multi-Select",
+    "checkbox": "Checkbox",
+    "radio": "Radio Buttons",
+    "date": "Date Picker",
+    "time": "Time Picker",
+    "file": "File Upload",
+    "slider": "Slider",
+    "color": "Color Picker"
+})
+FIELD_TYPE_KEYS = tuple(FIELD_TYPES)
+
+# Extensions a file field accepts when its config names none
+_DEFAULT_FILE_TYPES = ("pdf", "jpg", "png")
+
+_DEFAULT_FORMS = {
+    "contact_form": {
+        "name": "Contact Form",
+        "description": "Basic contact form for lead capture",
+        "fields": [
+            {"name": "full_name", "label": "Full Name", "type": "text", "required": True},
+            {"name": "email", "label": "Email Address", "type": "email", "required": True},
+            {"name": "phone", "label": "Phone Number", "type": "text", "required": False},
+            {"name": "company", "label": "Company", "type": "text", "required": False},
+            {"name": "message", "label": "Message", "type": "textarea", "required": True}
+        ],
+        "webhook_key": "lead_capture"
+    },
+    "feedback_form": {
+        "name": "Customer Feedback Form",
+        "description": "Collect customer feedback and ratings",
+        "fields": [
+            {"name": "customer_name", "label": "Your Name", "type": "text", "required": True},
+            {"name": "email", "label": "Email", "type": "email", "required": True},
+            {"name": "rating", "label": "Overall Rating", "type": "slider", "min_value": 1, "max_value": 5, "required": True},
+            {"name": "product", "label": "Product/Service", "type": "select", "options": ["Product A", "Product B", "Service X", "Service Y"], "required": True},
+            {"name": "feedback", "label": "Your Feedback", "type": "textarea", "required": True},
+            {"name": "recommend", "label": "Would you recommend us?", "type": "radio", "options": ["Yes", "No", "Maybe"], "required": True}
+        ],
+        "webhook_key": "customer_feedback"
+    },
+    "booking_form": {
+        "name": "Appointment Booking Form",
+        "description": "Schedule appointments and consultations",
+        "fields": [
+            {"name": "client_name", "label": "Full Name", "type": "text", "required": True},
+            {"name": "email", "label": "Email", "type": "email", "required": True},
+            {"name": "phone", "label": "Phone Number", "type": "text", "required": True},
+            {"name": "service", "label": "Service Type", "type": "select", "options": ["Consultation", "Meeting", "Demo", "Support"], "required": True},
+            {"name": "preferred_date", "label": "Preferred Date", "type": "date", "required": True},
+            {"name": "preferred_time", "label": "Preferred Time", "type": "time", "required": True},
+            {"name": "notes", "label": "Additional Notes", "type": "textarea", "required": False}
+        ],
+        "webhook_key": "appointment_booking"
+    }
+}
+
+# A required field fails when empty: any falsy value, or a blank string
+_REQUIRED_FIELD_SCHEMA = {
+    "not": {"anyOf": [
+        {"enum": [None, "", [], False, 0]},
+        {"type": "string", "pattern": r"^\s*$"}
+    ]}
+}
+
+def build_required_validator(required: tuple) -> Draft7Validator:
+    """Compile a JSON schema validator that rejects empty required fields"""
+    schema = {
+        "type": "object",
+        "properties": {name: _REQUIRED_FIELD_SCHEMA for name in required}
+    }
+    return Draft7Validator(schema)
+
+def validate_required(form_data: Dict, validator: Draft7Validator, labels: Dict) -> List[str]:
+    """Return an error message for each required field left empty"""
+    return [f"{labels[error.path[0]]} is required" for error in validator.iter_errors(form_data)]
+
+# Struct-of-arrays view of a form's fields, built by FormBuilder.index_forms
+CompiledForm = namedtuple('CompiledForm', 'names labels display_labels types required configs required_names label_map has_required validator')
+
+@fragment
+def _creator_fragment(builder: "FormBuilder"):
+    """Render the create tab as an independently rerunning fragment"""
+    builder.render_form_creator()
+
+@fragment
+def _editor_fragment(builder: "FormBuilder"):
+    """Render the edit tab as an independently rerunning fragment"""
+    builder.render_form_edit_tab()
 
 class FormBuilder:
     def __init__(self):
+        self.forms_db = "data/forms.db"
+        # Pre-SQLite forms file, read once to seed an unseeded database
         self.forms_file = "data/custom_forms.json"
         self.ensure_data_dir()
         self.load_forms()
-        self.field_types = {
-            "text": "Text Input",
-            "email": "Email Input",
-            "number": "Number Input",
-            "textarea": "Text Area",
-            "select": "Select Dropdown",
-            "multiselect": "Multi-Select",
-            "checkbox": "Checkbox",
-            "radio": "Radio Buttons",
-            "date": "Date Picker",
-            "time": "Time Picker",
-            "file": "File Upload",
-            "slider": "Slider",
-            "color": "Color Picker"
-        }
+        self.field_types = FIELD_TYPES
     
     def ensure_data_dir(self):
         """Ensure data directory exists"""
         os.makedirs("data", exist_ok=True)
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the forms database in WAL mode"""
+        return connect_forms_db(self.forms_db)
+    
     def load_forms(self):
-        """Load custom forms from file"""
+        """Load custom forms from the forms database"""
         try:
-            if os.path.exists(self.forms_file):
-                with open(self.forms_file, 'r') as f:
-                    self.custom_forms = json.load(f)
-            else:
-                self.custom_forms = self.get_default_forms()
-                self.save_forms()
+            # Seeding and its meta row commit together, so a failed seed is
+            # retried on the next load; the JSON file itself is left in place
+            with closing(self._connect()) as conn, conn:
+                seeded = conn.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone()
+                rows = conn.execute("SELECT key, config FROM forms ORDER BY rowid").fetchall()
+                if seeded or rows:
+                    forms = {key: jsonio.loads(config) for key, config in rows}
+                else:
+                    if os.path.exists(self.forms_file):
+                        # Seed from forms saved by earlier versions to the JSON file
+                        with open(self.forms_file, 'rb') as f:
+                            forms = jsonio.loads(f.read())
+                    else:
+                        forms = self.get_default_forms()
+                    conn.executemany(_UPSERT_FORM, [(key, jsonio.dumps(config)) for key, config in forms.items()])
+                if not seeded:
+                    conn.execute(_MARK_SEEDED, (datetime.now().isoformat(),))
+            
+            self.custom_forms = forms
         except Exception as e:
             st.error(f"Error loading forms: {e}")
             self.custom_forms = self.get_default_forms()
+        self.index_forms()
     
-    def save_forms(self):
-        """Save custom forms to file"""
+    def save_forms(self, form_key: str = None):
+        """Save one form, or sync every form when no key is given"""
         try:
-            with open(self.forms_file, 'w') as f:
-                json.dump(self.custom_forms, f, indent=2)
+            with closing(self._connect()) as conn, conn:
+                if form_key is not None:
+                    conn.execute(_UPSERT_FORM, (form_key, jsonio.dumps(self.custom_forms[form_key])))
+                else:
+                    conn.executemany(
+                        _UPSERT_FORM,
+                        [(key, jsonio.dumps(config)) for key, config in self.custom_forms.items()]
+                    )
+                    stored_keys = [row[0] for row in conn.execute("SELECT key FROM forms")]
+                    conn.executemany(
+                        "DELETE FROM forms WHERE key = ?",
+                        [(key,) for key in stored_keys if key not in self.custom_forms]
+                    )
         except Exception as e:
             st.error(f"Error saving forms: {e}")
+        self.index_forms()
+    
+    def delete_form(self, form_key: str):
+        """Delete a single form"""
+        self.custom_forms.pop(form_key, None)
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM forms WHERE key = ?", (form_key,))
+        except Exception as e:
+            st.error(f"Error deleting form: {e}")
+        self.index_forms()
+    
+    def index_forms(self):
+        """Compile each form's fields into parallel tuples, kept apart from the saved form configs"""
+        self.form_index = {}
+        for form_key, form_config in self.custom_forms.items():
+            fields = form_config.get("fields", [])
+            names = tuple(f.get("name", f"field_{i}") for i, f in enumerate(fields))
+            labels = tuple(f.get("label", name) for f, name in zip(fields, names))
+            required = tuple(bool(f.get("required", False)) for f in fields)
+            required_names = tuple(name for name, req in zip(names, required) if req)
+            self.form_index[form_key] = CompiledForm(
+                names=names,
+                labels=labels,
+                display_labels=tuple(
+                    f"{f.get('label', 'Field')} *" if req else f.get("label", "Field")
+                    for f, req in zip(fields, required)
+                ),
+                types=tuple(f.get("type", "text") for f in fields),
+                required=required,
+                configs=tuple(fields),
+                required_names=required_names,
+                label_map=dict(zip(names, labels)),
+                has_required=any(required),
+                validator=build_required_validator(required_names)
+            )
     
     def get_default_forms(self) -> Dict:
         """Get default form templates"""
-        return {
-            "contact_form": {
-                "name": "Contact Form",
-                "description": "Basic contact form for lead capture",
-                "fields": [
-                    {"name": "full_name", "label": "Full Name", "type": "text", "required": True},
-                    {"name": "email", "label": "Email Address", "type": "email", "required": True},
-                    {"name": "phone", "label": "Phone Number", "type": "text", "required": False},
-                    {"name": "company", "label": "Company", "type": "text", "required": False},
-                    {"name": "message", "label": "Message", "type": "textarea", "required": True}
-                ],
-                "webhook_key": "lead_capture"
-            },
-            "feedback_form": {
-                "name": "Customer Feedback Form",
-                "description": "Collect customer feedback and ratings",
-                "fields": [
-                    {"name": "customer_name", "label": "Your Name", "type": "text", "required": True},
-                    {"name": "email", "label": "Email", "type": "email", "required": True},
-                    {"name": "rating", "label": "Overall Rating", "type": "slider", "min_value": 1, "max_value": 5, "required": True},
-                    {"name": "product", "label": "Product/Service", "type": "select", "options": ["Product A", "Product B", "Service X", "Service Y"], "required": True},
-                    {"name": "feedback", "label": "Your Feedback", "type": "textarea", "required": True},
-                    {"name": "recommend", "label": "Would you recommend us?", "type": "radio", "options": ["Yes", "No", "Maybe"], "required": True}
-                ],
-                "webhook_key": "customer_feedback"
-            },
-            "booking_form": {
-                "name": "Appointment Booking Form",
-                "description": "Schedule appointments and consultations",
-                "fields": [
-                    {"name": "client_name", "label": "Full Name", "type": "text", "required": True},
-                    {"name": "email", "label": "Email", "type": "email", "required": True},
-                    {"name": "phone", "label": "Phone Number", "type": "text", "required": True},
-                    {"name": "service", "label": "Service Type", "type": "select", "options": ["Consultation", "Meeting", "Demo", "Support"], "required": True},
-                    {"name": "preferred_date", "label": "Preferred Date", "type": "date", "required": True},
-                    {"name": "preferred_time", "label": "Preferred Time", "type": "time", "required": True},
-                    {"name": "notes", "label": "Additional Notes", "type": "textarea", "required": False}
-                ],
-                "webhook_key": "appointment_booking"
-            }
-        }
+        return copy.deepcopy(_DEFAULT_FORMS)
     
-    def create_field(self, field_config: Dict, form_key: str) -> Any:
+    def create_field(self, field_config: Dict, form_key: str, display_label: str = None) -> Any:
         """Create a form field based on configuration"""
         field_name = field_config.get("name", "field")
-        field_label = field_config.get("label", "Field")
         field_type = field_config.get("type", "text")
-        required = field_config.get("required", False)
         key = f"{form_key}_{field_name}"
         
-        # Add required indicator to label
-        if required:
-            field_label += " *"
+        # Required indicator is normally precomputed by index_forms
+        field_label = display_label
+        if field_label is None:
+            field_label = field_config.get("label", "Field")
+            if field_config.get("required", False):
+                field_label += " *"
         
         try:
-            if field_type == "text":
-                return st.text_input(field_label, key=key)
-            
-            elif field_type == "email":
-                return st.text_input(field_label, key=key, placeholder="example@email.com")
-            
-            elif field_type == "number":
-                min_val = field_config.get("min_value", 0)
-                max_val = field_config.get("max_value", 100)
-                return st.number_input(field_label, min_value=min_val, max_value=max_val, key=key)
-            
-            elif field_type == "textarea":
-                return st.text_area(field_label, key=key)
-            
-            elif field_type == "select":
-                options = field_config.get("options", ["Option 1", "Option 2"])
-                return st.selectbox(field_label, options, key=key)
-            
-            elif field_type == "multiselect":
-                options = field_config.get("options", ["Option 1", "Option 2"])
-                return st.multiselect(field_label, options, key=key)
-            
-            elif field_type == "checkbox":
-                return st.checkbox(field_label, key=key)
-            
-            elif field_type == "radio":
-                options = field_config.get("options", ["Yes", "No"])
-                return st.radio(field_label, options, key=key)
-            
-            elif field_type == "date":
-                return st.date_input(field_label, key=key)
-            
-            elif field_type == "time":
-                return st.time_input(field_label, key=key)
-            
-            elif field_type == "file":
-                file_types = field_config.get("file_types", ["pdf", "jpg", "png"])
-                return st.file_uploader(field_label, type=file_types, key=key)
-            
-            elif field_type == "slider":
-                min_val = field_config.get("min_value", 0)
-                max_val = field_config.get("max_value", 100)
-                return st.slider(field_label, min_value=min_val, max_value=max_val, key=key)
-            
-            elif field_type == "color":
-                return st.color_picker(field_label, key=key)
-            
-            else:
-                return st.text_input(field_label, key=key)
-                
+            renderer = self._FIELD_RENDERERS.get(field_type, self._render_text)
+            return renderer(field_label, key, field_config)
         except Exception as e:
             st.error(f"Error creating field {field_name}: {e}")
             return None
     
+    @staticmethod
+    def _render_text(label: str, key: str, cfg: Dict) -> Any:
+        return st.text_input(label, key=key)
+    
+    @staticmethod
+    def _render_email(label: str, key: str, cfg: Dict) -> Any:
+        return st.text_input(label, key=key, placeholder="example@email.com")
+    
+    @staticmethod
+    def _render_number(label: str, key: str, cfg: Dict) -> Any:
+        return st.number_input(label, min_value=cfg.get("min_value", 0), max_value=cfg.get("max_value", 100), key=key)
+    
+    @staticmethod
+    def _render_textarea(label: str, key: str, cfg: Dict) -> Any:
+        return st.text_area(label, key=key)
+    
+    @staticmethod
+    def _render_select(label: str, key: str, cfg: Dict) -> Any:
+        return st.selectbox(label, cfg.get("options", ["Option 1", "Option 2"]), key=key)
+    
+    @staticmethod
+    def _render_multiselect(label: str, key: str, cfg: Dict) -> Any:
+        return st.multiselect(label, cfg.get("options", ["Option 1", "Option 2"]), key=key)
+    
+    @staticmethod
+    def _render_checkbox(label: str, key: str, cfg: Dict) -> Any:
+        return st.checkbox(label, key=key)
+    
+    @staticmethod
+    def _render_radio(label: str, key: str, cfg: Dict) -> Any:
+        return st.radio(label, cfg.get("options", ["Yes", "No"]), key=key)
+    
+    @staticmethod
+    def _render_date(label: str, key: str, cfg: Dict) -> Any:
+        return st.date_input(label, key=key)
+    
+    @staticmethod
+    def _render_time(label: str, key: str, cfg: Dict) -> Any:
+        return st.time_input(label, key=key)
+    
+    @staticmethod
+    def _render_file(label: str, key: str, cfg: Dict) -> Any:
+        return st.file_uploader(label, type=cfg.get("file_types", _DEFAULT_FILE_TYPES), key=key)
+    
+    @staticmethod
+    def _render_slider(label: str, key: str, cfg: Dict) -> Any:
+        return st.slider(label, min_value=cfg.get("min_value", 0), max_value=cfg.get("max_value", 100), key=key)
+    
+    @staticmethod
+    def _render_color(label: str, key: str, cfg: Dict) -> Any:
+        return st.color_picker(label, key=key)
+    
+    # Field type -> renderer, resolved once when the class is defined
+    _FIELD_RENDERERS = {
+        "text": _render_text,
+        "email": _render_email,
+        "number": _render_number,
+        "textarea": _render_textarea,
+        "select": _render_select,
+        "multiselect": _render_multiselect,
+        "checkbox": _render_checkbox,
+        "radio": _render_radio,
+        "date": _render_date,
+        "time": _render_time,
+        "file": _render_file,
+        "slider": _render_slider,
+        "color": _render_color
+    }
+    
     def render_form(self, form_key: str, webhook_manager=None) -> Dict:
         """Render a complete form"""
         if form_key not in self.custom_forms:
@@ -170,7 +331,6 @@ class FormBuilder:
         form_config = self.custom_forms[form_key]
         form_name = form_config.get("name", "Custom Form")
         form_description = form_config.get("description", "")
-        fields = form_config.get("fields", [])
         webhook_key = form_config.get("webhook_key", "")
         
         st.subheader(f"📝 {form_name}")
@@ -182,41 +342,38 @@ class FormBuilder:
             form_data = {}
             files_data = {}
             
-            # Create columns for better layout
-            if len(fields) > 4:
-                col1, col2 = st.columns(2)
-                for i, field in enumerate(fields):
-                    with col1 if i % 2 == 0 else col2:
-                        value = self.create_field(field, form_key)
-                        field_name = field.get("name", f"field_{i}")
-                        
-                        if field.get("type") == "file" and value:
-                            files_data[field_name] = value
-                        else:
-                            form_data[field_name] = value
-            else:
-                for field in fields:
-                    value = self.create_field(field, form_key)
-                    field_name = field.get("name", f"field_{len(form_data)}")
-                    
-                    if field.get("type") == "file" and value:
-                        files_data[field_name] = value
-                    else:
-                        form_data[field_name] = value
+            # Walk the compiled field columns by index; more than four
+            # fields are laid out across two columns
+            compiled = self.form_index[form_key]
+            columns = st.columns(2) if len(compiled.names) > 4 else None
+            for i, field_name in enumerate(compiled.names):
+                if columns:
+                    with columns[i % 2]:
+                        value = self.create_field(compiled.configs[i], form_key, compiled.display_labels[i])
+                else:
+                    value = self.create_field(compiled.configs[i], form_key, compiled.display_labels[i])
+                
+                if compiled.types[i] == "file" and value:
+                    files_data[field_name] = value
+                else:
+                    form_data[field_name] = value
+            
+            parallel_upload = False
+            if "file" in compiled.types:
+                parallel_upload = st.checkbox(
+                    "Parallel upload",
+                    key=f"{form_key}_parallel_upload",
+                    help="Send each file in its own request, several at a time"
+                )
             
             # Submit button
             submitted = st.form_submit_button(f"Submit {form_name}")
             
             if submitted:
-                # Validate required fields
+                # Validate required fields; forms without any skip the pass entirely
                 validation_errors = []
-                for field in fields:
-                    if field.get("required", False):
-                        field_name = field.get("name")
-                        if field_name in form_data:
-                            value = form_data[field_name]
-                            if not value or (isinstance(value, str) and not value.strip()):
-                                validation_errors.append(f"{field.get('label', field_name)} is required")
+                if compiled.has_required:
+                    validation_errors = validate_required(form_data, compiled.validator, compiled.label_map)
                 
                 if validation_errors:
                     for error in validation_errors:
@@ -234,12 +391,16 @@ class FormBuilder:
                 # Send to webhook if configured
                 if webhook_manager and webhook_key:
                     # Prepare files for webhook
-                    webhook_files = {}
-                    for field_name, file_obj in files_data.items():
-                        if file_obj:
-                            webhook_files[field_name] = (file_obj.name, file_obj.getvalue(), file_obj.type)
+                    # Hand requests the file objects themselves, rewound, rather than
+                    # bytes copies; files_data only holds fields that got an upload
+                    for file_obj in files_data.values():
+                        file_obj.seek(0)
+                    webhook_files = [
+                        (field_name, (file_obj.name, file_obj, file_obj.type))
+                        for field_name, file_obj in files_data.items()
+                    ]
                     
-                    result = webhook_manager.send_to_webhook(webhook_key, form_data, webhook_files)
+                    result = webhook_manager.send_to_webhook(webhook_key, form_data, webhook_files, parallel=parallel_upload)
                     
                     if result.get("success"):
                         st.success("✅ Form submitted successfully!")
@@ -277,27 +438,30 @@ class FormBuilder:
                             st.session_state[f"edit_form"] = form_key
                     with col3:
                         if st.button(f"Delete {form_key}", key=f"delete_form_{form_key}"):
-                            del self.custom_forms[form_key]
-                            self.save_forms()
+                            self.delete_form(form_key)
                             st.success(f"Deleted form: {form_key}")
                             st.rerun()
         
         with tab2:
             st.write("### Create New Form")
-            self.render_form_creator()
+            _creator_fragment(self)
         
         with tab3:
             st.write("### Edit Existing Form")
-            if self.custom_forms:
-                form_to_edit = st.selectbox(
-                    "Select form to edit",
-                    options=list(self.custom_forms.keys()),
-                    format_func=lambda x: self.custom_forms[x].get('name', x)
-                )
-                if form_to_edit:
-                    self.render_form_editor(form_to_edit)
-            else:
-                st.info("No forms available to edit. Create a new form first.")
+            _editor_fragment(self)
+    
+    def render_form_edit_tab(self):
+        """Render the form picker and editor for the edit tab"""
+        if self.custom_forms:
+            form_to_edit = st.selectbox(
+                "Select form to edit",
+                options=list(self.custom_forms.keys()),
+                format_func=lambda x: self.custom_forms[x].get('name', x)
+            )
+            if form_to_edit:
+                self.render_form_editor(form_to_edit)
+        else:
+            st.info("No forms available to edit. Create a new form first.")
     
     def render_form_creator(self):
         """Render form creation interface"""
@@ -334,7 +498,7 @@ class FormBuilder:
                 st.write("#### Add New Field")
                 field_name = st.text_input("Field Name", placeholder="field_name")
                 field_label = st.text_input("Field Label", placeholder="Field Label")
-                field_type = st.selectbox("Field Type", options=list(self.field_types.keys()), format_func=lambda x: self.field_types[x])
+                field_type = st.selectbox("Field Type", options=FIELD_TYPE_KEYS, format_func=FIELD_TYPES.__getitem__)
                 field_required = st.checkbox("Required Field")
                 
                 # Additional options based on field type
@@ -389,7 +553,7 @@ class FormBuilder:
                     }
                     
                     self.custom_forms[form_key] = new_form
-                    self.save_forms()
+                    self.save_forms(form_key)
                     
                     # Clear session state
                     st.session_state.new_form_fields = []
@@ -423,7 +587,11 @@ class FormBuilder:
                     "description": form_description,
                     "webhook_key": webhook_key
                 })
-                self.save_forms()
+                self.save_forms(form_key)
                 st.success("✅ Form updated successfully!")
                 st.rerun()
 
+@st.cache_resource
+def get_form_builder() -> FormBuilder:
+    """Get the FormBuilder shared across Streamlit reruns"""
+    return FormBuilder()
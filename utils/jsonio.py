@@ -0,0 +1,35 @@
+# JSON helpers shared by the app: orjson when installed, stdlib json otherwise
+import json
+from datetime import date, datetime, time
+from typing import Any
+
+try:
+    import orjson
+
+    def loads(data) -> Any:
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes, compact unless indent is set"""
+        # orjson writes date/time/datetime natively; default covers anything else.
+        # Excel sample records can carry non-str (e.g. int or datetime) keys
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str)
+except ImportError:
+    def _default(obj) -> str:
+        return obj.isoformat() if isinstance(obj, (date, datetime, time)) else str(obj)
+
+    def loads(data) -> Any:
+        """Parse JSON from bytes or str"""
+        return json.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes, compact unless indent is set"""
+        if indent:
+            return json.dumps(obj, indent=2, default=_default).encode("utf-8")
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+def dumps_str(obj, indent: bool = False) -> str:
+    """Serialize to a JSON string, for display in widgets"""
+    return dumps(obj, indent).decode("utf-8")
@@ -1,9 +1,64 @@
 import streamlit as st
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import jsonio
+
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Concurrent requests when fanning out file uploads one file per request
+MAX_PARALLEL_UPLOADS = 6
+
+# Bytes of a webhook's response body kept for display
+RESPONSE_PREVIEW_BYTES = 500
+
+# Largest combined file upload sent to a webhook, checked before posting
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Get a process-wide HTTP session that keeps webhook connections alive"""
+    session = requests.Session()
+    # urllib3 does not retry POST once the request was sent, so these retries
+    # only cover connection failures
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _response_preview(response: requests.Response) -> str:
+    """Read at most RESPONSE_PREVIEW_BYTES of a streamed response body, then close it"""
+    with response:
+        preview = next(response.iter_content(RESPONSE_PREVIEW_BYTES), b"")
+    if not preview:
+        return "No response"
+    return preview.decode(response.encoding or "utf-8", errors="replace")
+
+def _multipart_fields(payload: Dict) -> List:
+    """Turn a payload into multipart form fields, JSON-encoding dicts and lists"""
+    fields = []
+    for name, value in payload.items():
+        if value is None:
+            continue
+        if isinstance(value, (dict, list, tuple)):
+            value = jsonio.dumps_str(value)
+        elif not isinstance(value, (str, bytes)):
+            value = str(value)
+        fields.append((name, value))
+    return fields
 
 class WebhookManager:
     def __init__(self):
@@ -111,17 +166,18 @@ class WebhookManager:
             }
         
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 webhook_url, 
-                json=test_data, 
-                timeout=10,
-                headers={"Content-Type": "application/json"}
+                data=jsonio.dumps(test_data), 
+                timeout=(3, 10),
+                headers={"Content-Type": "application/json"},
+                stream=True
             )
             
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "response": response.text[:500] if response.text else "No response",
+                "response": _response_preview(response),
                 "error": None
             }
         except requests.exceptions.RequestException as e:
@@ -132,7 +188,7 @@ class WebhookManager:
                 "error": str(e)
             }
     
-    def send_to_webhook(self, webhook_key: str, data: Dict, files: Dict = None) -> Dict:
+    def send_to_webhook(self, webhook_key: str, data: Dict, files: Union[Dict, List] = None, parallel: bool = False) -> Dict:
         """Send data to specific webhook"""
         webhook = self.get_webhook(webhook_key)
         
@@ -158,20 +214,49 @@ class WebhookManager:
                 "source": "n8n_business_suite"
             }
             
-            if files:
-                response = requests.post(webhook_url, data=payload, files=files, timeout=30)
+            # (field, file tuple) pairs let several files share one field name
+            if isinstance(files, dict):
+                files = list(files.items())
+            
+            # UploadedFile knows its size, so reject oversized uploads before
+            # streaming them only to have the server turn them away
+            total_bytes = sum(getattr(file_tuple[1], "size", 0) for _, file_tuple in files or ())
+            if total_bytes > MAX_UPLOAD_BYTES:
+                return {
+                    "success": False,
+                    "status_code": None,
+                    "response": None,
+                    "error": f"Total upload {total_bytes / 1e6:.1f} MB exceeds the {MAX_UPLOAD_BYTES / 1e6:.0f} MB limit"
+                }
+            
+            if files and parallel:
+                return self._send_files_parallel(webhook_url, payload, files)
+            
+            if files and MultipartEncoder is not None:
+                # Stream the multipart body straight from the file objects
+                encoder = MultipartEncoder(fields=_multipart_fields(payload) + files)
+                response = get_http_session().post(
+                    webhook_url,
+                    data=encoder,
+                    timeout=(3, 60),
+                    headers={"Content-Type": encoder.content_type},
+                    stream=True
+                )
+            elif files:
+                response = get_http_session().post(webhook_url, data=_multipart_fields(payload), files=files, timeout=(3, 60), stream=True)
             else:
-                response = requests.post(
+                response = get_http_session().post(
                     webhook_url, 
-                    json=payload, 
-                    timeout=30,
-                    headers={"Content-Type": "application/json"}
+                    data=jsonio.dumps(payload), 
+                    timeout=(3, 30),
+                    headers={"Content-Type": "application/json"},
+                    stream=True
                 )
             
             return {
                 "success": response.status_code == 200,
                 "status_code": response.status_code,
-                "response": response.text[:500] if response.text else "No response",
+                "response": _response_preview(response),
                 "error": None
             }
         except requests.exceptions.RequestException as e:
@@ -182,6 +267,56 @@ class WebhookManager:
                 "error": str(e)
             }
     
+    def _send_files_parallel(self, webhook_url: str, payload: Dict, files: List) -> Dict:
+        """Post the fields as JSON, then fan each file out in its own concurrent request"""
+        session = get_http_session()
+        response = session.post(
+            webhook_url,
+            data=jsonio.dumps(payload),
+            timeout=(3, 30),
+            headers={"Content-Type": "application/json"},
+            stream=True
+        )
+        # Release the connection before the file requests start
+        preview = _response_preview(response)
+        
+        # Don't send files for a submission the webhook already rejected
+        if response.status_code != 200:
+            return {
+                "success": False,
+                "status_code": response.status_code,
+                "response": preview,
+                "error": f"HTTP {response.status_code}; files not sent"
+            }
+        
+        def post_file(item):
+            field_name, file_tuple = item
+            try:
+                file_response = session.post(
+                    webhook_url,
+                    data={"webhook_key": payload["webhook_key"], "timestamp": payload["timestamp"]},
+                    files={field_name: file_tuple},
+                    timeout=(3, 60),
+                    stream=True
+                )
+                # Only the status matters here; drop the body unread
+                file_response.close()
+                if file_response.status_code == 200:
+                    return None
+                return f"{field_name}: HTTP {file_response.status_code}"
+            except requests.exceptions.RequestException as e:
+                return f"{field_name}: {e}"
+        
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_UPLOADS) as executor:
+            file_errors = [error for error in executor.map(post_file, files) if error]
+        
+        return {
+            "success": not file_errors,
+            "status_code": response.status_code,
+            "response": preview,
+            "error": "; ".join(file_errors) or None
+        }
+    
     def render_webhook_selector(self, key: str = "webhook_selector") -> str:
         """Render webhook selector in Streamlit"""
         webhook_options = {k: v['name'] for k, v in self.webhooks.items() if v.get('active', False)}
@@ -282,3 +417,7 @@ class WebhookManager:
                     else:
                         st.error("Please enter a webhook URL to test")
 
+@st.cache_resource
+def get_webhook_manager() -> WebhookManager:
+    """Get the WebhookManager shared across Streamlit reruns"""
+    return WebhookManager()